@@ -1,6 +1,6 @@
 import os
 import re
-import json
+import orjson
 import arxiv
 import yaml
 import logging
@@ -8,7 +8,12 @@ import argparse
 import datetime
 import requests
 import time
+import random
+import functools
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from dateutil.relativedelta import relativedelta
+from requests.adapters import HTTPAdapter
 
 logging.basicConfig(format='[%(asctime)s %(levelname)s] %(message)s',
                     datefmt='%m/%d/%Y %H:%M:%S',
@@ -17,6 +22,158 @@ logging.basicConfig(format='[%(asctime)s %(levelname)s] %(message)s',
 base_url = "https://arxiv.paperswithcode.com/api/v0/papers/"
 github_url = "https://api.github.com/search/repositories"
 arxiv_url = "http://arxiv.org/"
+oai_url = "https://export.arxiv.org/oai2"
+
+# OAI-PMH sets matching the categories searched by get_daily_papers
+OAI_SETS = ["math:math:SG", "math:math:DG", "math:math:AG", "math:math:QA", "physics:math-ph"]
+OAI_NS = "{http://www.openarchives.org/OAI/2.0/}"
+ARXIV_NS = "{http://arxiv.org/OAI/arXiv/}"
+
+# Inline TeX math such as "$k$" in a title (one pair of dollars, not greedy across pairs)
+_MATH_RE = re.compile(r"\$[^$]*\$")
+# A markdown link "[text](url)"
+_LINK_RE = re.compile(r'\[([^\]]+)\]\([^)]+\)')
+
+# Shared HTTP session: keep-alive connections are reused across lookups
+SESSION = requests.Session()
+SESSION.headers.update({
+    "User-Agent": "symplectic-arxiv-daily/1.0 (+https://github.com/YassineAitMohamed/Symplectic-arXiv-Daily)"
+})
+# Retries are left to http_request (with_backoff), so the adapter does none itself
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=0
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+# Shared arxiv client: bigger pages mean fewer paced round-trips, and it
+# keeps the 3s delay between requests across searches
+ARXIV_CLIENT = arxiv.Client(page_size=200, delay_seconds=3.0, num_retries=5)
+
+# Number of concurrent paperswithcode lookups and arxiv.org link checks
+PWC_WORKERS = 8
+LINK_WORKERS = 4
+
+# Log fetch progress once every this many papers
+LOG_EVERY = 50
+
+class TransientError(Exception):
+    """
+    HTTP failure worth retrying (connection problems, timeouts, 429 and 5xx)
+    """
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def with_backoff(attempts=4, initial=2, max_wait=60):
+    """
+    Retry the wrapped call on TransientError with exponential backoff and jitter.
+    A Retry-After value carried by the error takes precedence over the computed wait.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(attempts):
+                try:
+                    return func(*args, **kwargs)
+                except TransientError as e:
+                    if attempt == attempts - 1:
+                        raise
+                    wait = e.retry_after
+                    if wait is None:
+                        wait = min(max_wait, initial * 2 ** attempt) + random.uniform(0, initial)
+                    logging.warning(f"{e}, retrying in {wait:.1f}s ({attempt + 1}/{attempts - 1})")
+                    time.sleep(wait)
+        return wrapper
+    return decorator
+
+def _retry_after(response):
+    value = response.headers.get("Retry-After", "")
+    return min(int(value), 60) if value.isdigit() else None
+
+@with_backoff()
+def http_request(method, url, **kwargs):
+    """
+    Issue a request on the shared session, raising TransientError for retryable failures
+    """
+    try:
+        response = SESSION.request(method, url, **kwargs)
+    except (requests.ConnectionError, requests.Timeout) as e:
+        raise TransientError(f"{method} {url} failed: {e}")
+    if response.status_code == 429 or response.status_code >= 500:
+        raise TransientError(f"{method} {url} returned {response.status_code}",
+                             retry_after=_retry_after(response))
+    return response
+
+# paperswithcode has no batch endpoint; memoizing at least avoids refetching
+# papers that turn up under several keywords in the same run
+@functools.lru_cache(maxsize=65536)
+def _fetch_pwc(paper_id):
+    """
+    Return the official code repository url of a paper on paperswithcode, or None
+    """
+    response = http_request("GET", base_url + paper_id, timeout=10)
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    r = response.json()
+    if "official" in r and r["official"]:
+        return r["official"]["url"]
+    return None
+
+# Cached HTTP results older than this are looked up again
+CACHE_EXPIRE_AFTER = datetime.timedelta(days=30)
+# Link validators (ETag/Last-Modified) only make HEAD checks conditional, so they live longer
+VALIDATORS_EXPIRE_AFTER = datetime.timedelta(days=180)
+_MISSING = object()
+
+def _cache_max_age(key):
+    if key.startswith("validators:"):
+        return VALIDATORS_EXPIRE_AFTER
+    return CACHE_EXPIRE_AFTER
+
+def _cache_expired(key, entry, today):
+    return today - datetime.date.fromisoformat(entry["time"]) > _cache_max_age(key)
+
+def _prune_cache(cache):
+    """
+    Drop expired entries so the cache file does not grow without bound
+    """
+    today = datetime.date.today()
+    return {key: entry for key, entry in cache.items() if not _cache_expired(key, entry, today)}
+
+def load_cache(cache_file):
+    """
+    Load the on-disk lookup cache, a dict of key -> {"time": iso date, "value": ...}
+    """
+    if not cache_file or not os.path.exists(cache_file):
+        return {}
+    with open(cache_file, "rb") as f:
+        content = f.read()
+        return _prune_cache(orjson.loads(content)) if content else {}
+
+def save_cache(cache_file, cache):
+    if not cache_file or cache is None:
+        return
+    with open(cache_file, "wb") as f:
+        f.write(orjson.dumps(_prune_cache(cache)))
+
+def cache_get(cache, key):
+    """
+    Return the cached value for key, or _MISSING if absent, expired or caching is off
+    """
+    if cache is None or key not in cache:
+        return _MISSING
+    entry = cache[key]
+    if _cache_expired(key, entry, datetime.date.today()):
+        return _MISSING
+    return entry["value"]
+
+def cache_put(cache, key, value):
+    if cache is not None:
+        cache[key] = {"time": datetime.date.today().isoformat(), "value": value}
 
 def load_config(config_file: str) -> dict:
     '''
@@ -26,20 +183,9 @@ def load_config(config_file: str) -> dict:
     # make filters pretty
     def pretty_filters(**config) -> dict:
         keywords = dict()
-        EXCAPE = '\"'
-        QUOTA = '' # NO-USE
-        OR = ' OR ' # Updated for better readability
         def parse_filters(filters: list):
-            ret = ''
-            for idx in range(0, len(filters)):
-                filter = filters[idx]
-                if len(filter.split()) > 1:
-                    ret += (EXCAPE + filter + EXCAPE)  
-                else:
-                    ret += (QUOTA + filter + QUOTA)   
-                if idx != len(filters) - 1:
-                    ret += OR
-            return ret
+            # quote multi-word filters so arXiv matches them as phrases
+            return ' OR '.join(f'"{f}"' if len(f.split()) > 1 else f for f in filters)
         for k, v in config['keywords'].items():
             keywords[k] = parse_filters(v['filters'])
         return keywords
@@ -56,25 +202,91 @@ def get_authors(authors):
     """
     return ", ".join(author.name for author in authors)
 
-def sort_papers(papers):
-    output = dict()
-    keys = list(papers.keys())
-    keys.sort(reverse=True)
-    for key in keys:
-        output[key] = papers[key]
-    return output    
+def _inflected(word):
+    """
+    Regex for a filter word that also accepts its plural/verb endings. Words of one or
+    two letters ("K", "J") and compounds ("Gromov-Witten") must match exactly
+    """
+    if len(word) <= 2 or not word.isalpha():
+        return re.escape(word)
+    if word[-1] in 'yY' and word[-2] not in 'aeiouAEIOU':
+        return re.escape(word[:-1]) + r'(?:y|ies)'
+    return re.escape(word) + r'(?:s|es|ed|ing)?'
 
-def get_daily_papers(topic, query="symplectic geometry", max_results=50, start_date=None, end_date=None):
+def keyword_pattern(query):
+    """
+    Compile a parsed filter string ('"a b" OR c OR ...') into a case-insensitive regex
+    that matches any of the filters as whole words. Like the arXiv search, which stems
+    terms, words also match their inflected forms ("moment map" matches "Moment maps")
+    """
+    terms = [t.strip().strip('"') for t in query.split(' OR ')]
+    alternatives = '|'.join(r'\s+'.join(map(_inflected, t.split())) for t in terms if t)
+    return re.compile(rf'\b(?:{alternatives})\b', re.IGNORECASE)
+
+def lookup_repos(paper_ids, cache=None):
+    """
+    Look up the code repositories of paper_ids on paperswithcode
+    @return: dict of paper id -> repo url or None
+    """
+    repos = dict()
+    futures = dict()
+    # lookups are independent and network-bound, so run them concurrently;
+    # ids already in the cache are not requested again
+    with ThreadPoolExecutor(max_workers=PWC_WORKERS) as executor:
+        for paper_id in dict.fromkeys(paper_ids):
+            repo_url = cache_get(cache, "pwc:" + paper_id)
+            if repo_url is _MISSING:
+                futures[paper_id] = executor.submit(_fetch_pwc, paper_id)
+            else:
+                repos[paper_id] = repo_url
+
+    for paper_id, future in futures.items():
+        try:
+            repos[paper_id] = future.result()
+            cache_put(cache, "pwc:" + paper_id, repos[paper_id])
+        except (TransientError, requests.RequestException, ValueError) as e:
+            # keep the paper, just without a code link
+            logging.error(f"paperswithcode lookup failed: {e} with id: {paper_id}")
+            repos[paper_id] = None
+    return repos
+
+def format_paper(paper_key, paper, use_list=False):
+    """
+    Render a stored paper record as a markdown table row, or as a list item (wechat page)
+    @param paper_key: str, arXiv id without version; the paper url is rebuilt from it
+    @param paper: list [update date, title, authors, repo url or None, comments or None]
+    @return: str
+    """
+    update_time, title, authors, repo_url, comments = paper
+    paper_url = arxiv_url + 'abs/' + paper_key
+    if use_list:
+        code = f", Code: **[{repo_url}]({repo_url})**" if repo_url is not None else ""
+        extra = f", {comments}" if comments is not None else ""
+        return f"- {update_time}, **{title}**, {authors}, Paper: [{paper_url}]({paper_url}){code}{extra}\n"
+    code = f"**[link]({repo_url})**" if repo_url is not None else "null"
+    return f"|**{update_time}**|**{title}**|{authors}|[{paper_key}]({paper_url})|{code}|\n"
+
+def paper_key_of(paper_id):
+    """
+    Strip the version from an arXiv id: 2301.01234v2 -> 2301.01234
+    """
+    ver_pos = paper_id.find('v')
+    if ver_pos == -1:
+        return paper_id
+    return paper_id[0:ver_pos]
+
+def get_daily_papers(topic, query="symplectic geometry", max_results=50, start_date=None, end_date=None,
+                     cache=None):
     """
     @param topic: str
     @param query: str
     @param max_results: int
     @param start_date: datetime.date or None
     @param end_date: datetime.date or None
-    @return paper_with_code: dict
+    @param cache: dict or None, paperswithcode lookup cache (see load_cache)
+    @return paper_with_code: dict of topic -> {paper key: paper record (see format_paper)}
     """
     content = dict() 
-    content_to_web = dict()
     
     # Enhanced search for symplectic geometry with categories
     categories = "cat:math.SG OR cat:math.DG OR cat:math.AG OR cat:math-ph OR cat:math.QA"
@@ -94,11 +306,16 @@ def get_daily_papers(topic, query="symplectic geometry", max_results=50, start_d
         sort_order=arxiv.SortOrder.Descending
     )
 
-    for result in search_engine.results():
+    results = list(ARXIV_CLIENT.results(search_engine))
+
+    repos = lookup_repos([result.get_short_id() for result in results], cache)
+
+    log_progress = logging.getLogger().isEnabledFor(logging.INFO)
+
+    for i, result in enumerate(results):
         paper_id = result.get_short_id()
         paper_title = result.title
         paper_url = result.entry_id
-        code_url = base_url + paper_id
         paper_abstract = result.summary.replace("\n", " ")
         paper_authors = get_authors(result.authors)
         primary_category = result.primary_category
@@ -106,193 +323,325 @@ def get_daily_papers(topic, query="symplectic geometry", max_results=50, start_d
         update_time = result.updated.date()
         comments = result.comment
 
-        logging.info(f"Time = {update_time} title = {paper_title[:50]}... author = {paper_authors[:30]}...")
+        # one line per LOG_EVERY papers rather than per paper
+        if log_progress and i % LOG_EVERY == 0:
+            logging.info(f"[{i + 1}/{len(results)}] Time = {update_time} title = {paper_title[:50]}... "
+                         f"author = {paper_authors[:30]}...")
 
-        ver_pos = paper_id.find('v')
-        if ver_pos == -1:
-            paper_key = paper_id
-        else:
-            paper_key = paper_id[0:ver_pos]    
-        paper_url = arxiv_url + 'abs/' + paper_key
+        paper_key = paper_key_of(paper_id)
         
-        try:
-            r = requests.get(code_url).json()
-            repo_url = None
-            if "official" in r and r["official"]:
-                repo_url = r["official"]["url"]
-            
-            if repo_url is not None:
-                content[paper_key] = "|**{}**|**{}**|{}|[{}]({})|**[link]({})**|\n".format(
-                       update_time, paper_title, paper_authors, paper_key, paper_url, repo_url)
-                content_to_web[paper_key] = "- {}, **{}**, {}, Paper: [{}]({}), Code: **[{}]({})**".format(
-                       update_time, paper_title, paper_authors, paper_url, paper_url, repo_url, repo_url)
-            else:
-                content[paper_key] = "|**{}**|**{}**|{}|[{}]({})|null|\n".format(
-                       update_time, paper_title, paper_authors, paper_key, paper_url)
-                content_to_web[paper_key] = "- {}, **{}**, {}, Paper: [{}]({})".format(
-                       update_time, paper_title, paper_authors, paper_url, paper_url)
+        content[paper_key] = [str(update_time), paper_title, paper_authors, repos[paper_id], comments]
 
-            if comments is not None:
-                content_to_web[paper_key] += f", {comments}\n"
-            else:
-                content_to_web[paper_key] += f"\n"
-
-        except Exception as e:
-            logging.error(f"exception: {e} with id: {paper_key}")
+    logging.info(f"{topic}: {len(content)} papers")
 
     data = {topic: content}
-    data_web = {topic: content_to_web}
-    return data, data_web 
+    return data
 
-def get_historical_papers(topic, query, start_year=1990, end_year=None, max_per_year=500):
+def harvest_oai(set_spec, from_date, until_date=None):
     """
-    Collect all papers from start_year to end_year
-    @param topic: str
-    @param query: str  
+    Yield the <arXiv> metadata elements of an OAI-PMH ListRecords stream,
+    following resumption tokens until the list is exhausted
+    @param set_spec: str, e.g. "math:math:SG"
+    @param from_date: str, YYYY-MM-DD lower bound on the record datestamp
+    @param until_date: str or None, YYYY-MM-DD upper bound on the record datestamp
+    """
+    params = {"verb": "ListRecords", "metadataPrefix": "arXiv", "set": set_spec, "from": from_date}
+    if until_date:
+        params["until"] = until_date
+    while params:
+        # arXiv signals flow control with 503 + Retry-After, which http_request honours
+        response = http_request("GET", oai_url, params=params, timeout=60)
+        response.raise_for_status()
+        root = ET.fromstring(response.content)
+
+        error = root.find(f"{OAI_NS}error")
+        if error is not None:
+            if error.get("code") == "noRecordsMatch":
+                return
+            raise RuntimeError(f"OAI-PMH error {error.get('code')}: {error.text}")
+
+        list_records = root.find(f"{OAI_NS}ListRecords")
+        if list_records is None:
+            raise RuntimeError("OAI-PMH response has neither <error> nor <ListRecords>")
+        for record in list_records.iter(f"{OAI_NS}record"):
+            # deleted records carry a header only
+            metadata = record.find(f"{OAI_NS}metadata/{ARXIV_NS}arXiv")
+            if metadata is not None:
+                yield metadata
+
+        token = list_records.find(f"{OAI_NS}resumptionToken")
+        if token is not None and token.text:
+            params = {"verb": "ListRecords", "resumptionToken": token.text}
+        else:
+            params = None
+
+def parse_oai_record(metadata):
+    """
+    Extract the fields used here from an <arXiv> OAI-PMH metadata element
+    @return: dict
+    """
+    def text(tag):
+        node = metadata.find(ARXIV_NS + tag)
+        if node is None or node.text is None:
+            return None
+        return " ".join(node.text.split())
+
+    authors = []
+    for author in metadata.iter(f"{ARXIV_NS}author"):
+        parts = [author.findtext(ARXIV_NS + tag) for tag in ("forenames", "keyname", "suffix")]
+        authors.append(" ".join(p.strip() for p in parts if p))
+
+    return {
+        "key": text("id"),
+        "title": text("title"),
+        "authors": ", ".join(authors),
+        "abstract": text("abstract") or "",
+        "comments": text("comments"),
+        "created": datetime.date.fromisoformat(text("created")),
+        "updated": datetime.date.fromisoformat(text("updated") or text("created")),
+    }
+
+def _harvest_year(year, patterns, start_year, end_year, cache=None):
+    """
+    Harvest the records whose OAI-PMH datestamp falls in year once, keeping papers
+    submitted between start_year and end_year and sorting them into every topic
+    whose pattern they match
+    @param patterns: dict of topic -> compiled keyword_pattern
+    @return: dict of topic -> {paper key: paper record}
+    """
+    papers = {topic: dict() for topic in patterns}
+    records = dict()
+    for set_spec in OAI_SETS:
+        for metadata in harvest_oai(set_spec, f"{year}-01-01", f"{year}-12-31"):
+            paper = parse_oai_record(metadata)
+            if not start_year <= paper["created"].year <= end_year:
+                continue
+            text = paper["title"] + " " + paper["abstract"]
+            topics = [topic for topic, pattern in patterns.items() if pattern.search(text) is not None]
+            if not topics:
+                continue
+            # only what a record needs; the abstract is dropped here
+            record = [str(paper["updated"]), paper["title"], paper["authors"], None, paper["comments"]]
+            records[paper["key"]] = record
+            for topic in topics:
+                papers[topic][paper["key"]] = record
+
+    repos = lookup_repos(list(records), cache)
+    for paper_key, record in records.items():
+        record[3] = repos[paper_key]
+    return papers
+
+def _load_partition(partition, year, keywords):
+    """
+    Load a year partition written by get_historical_papers
+    @param keywords: dict of topic -> query the partition must have been filtered with
+    @return: dict of topic -> papers, or None if there is none, it was written before
+             the year was over (records of later months would be missing) or with
+             different keyword filters
+    """
+    if not partition or not os.path.exists(partition):
+        return None
+    with open(partition, "rb") as f:
+        content = orjson.loads(f.read())
+    if content.get("harvested", "") <= f"{year}-12-31":
+        return None
+    if content.get("keywords") != keywords:
+        logging.warning(f"Keyword filters changed since {partition} was harvested, harvesting {year} again")
+        return None
+    return content["papers"]
+
+def get_historical_papers(keywords, start_year=1990, end_year=None, cache=None, partition_dir=None):
+    """
+    Collect all papers from start_year to end_year by harvesting the arXiv
+    OAI-PMH interface once and filtering by each topic's keywords locally
+    @param keywords: dict of topic -> query
     @param start_year: int
     @param end_year: int or None (defaults to current year)
-    @param max_per_year: int
-    @return: dict, dict
+    @param cache: dict or None, paperswithcode lookup cache
+    @param partition_dir: str or None; if set, each harvested year is saved there as
+                          <year>.json and reused by later runs once the year is over,
+                          so a crashed run resumes
+    @return: dict of topic -> {paper key: paper record (see format_paper)}
     """
+    this_year = datetime.date.today().year
     if end_year is None:
-        end_year = datetime.datetime.now().year
-    
-    all_content = dict()
-    all_content_web = dict()
-    
+        end_year = this_year
+
+    patterns = {topic: keyword_pattern(query) for topic, query in keywords.items()}
+    content = {topic: dict() for topic in keywords}
+
     logging.info(f"Starting historical collection from {start_year} to {end_year}")
-    
-    for year in range(start_year, end_year + 1):
-        logging.info(f"Processing year {year}...")
-        
-        # Define date range for the year
-        start_date = datetime.date(year, 1, 1)
-        end_date = datetime.date(year, 12, 31)
-        
-        try:
-            data, data_web = get_daily_papers(
-                topic=topic, 
-                query=query, 
-                max_results=max_per_year,
-                start_date=start_date,
-                end_date=end_date
-            )
-            
-            # Merge results
-            for topic_key in data:
-                if topic_key in all_content:
-                    all_content[topic_key].update(data[topic_key])
-                    all_content_web[topic_key].update(data_web[topic_key])
-                else:
-                    all_content[topic_key] = data[topic_key]
-                    all_content_web[topic_key] = data_web[topic_key]
-            
-            logging.info(f"Year {year} completed. Found {len(data[topic])} papers.")
-            
-            # Add delay to respect arXiv rate limits
-            time.sleep(3)
-            
-        except Exception as e:
-            logging.error(f"Error processing year {year}: {e}")
-            # Continue with next year
-            continue
-    
-    total_papers = sum(len(content) for content in all_content.values())
-    logging.info(f"Historical collection completed. Total papers: {total_papers}")
-    
-    return all_content, all_content_web
 
-def update_paper_links(json_file):
+    if partition_dir:
+        os.makedirs(partition_dir, exist_ok=True)
+
+    # A record's datestamp is never older than its submission, so harvesting the
+    # datestamp years from start_year on covers the range; a paper whose metadata
+    # changed in several years is kept with its latest record
+    for year in range(start_year, this_year + 1):
+        partition = os.path.join(partition_dir, f"{year}.json") if partition_dir else None
+
+        papers = _load_partition(partition, year, keywords)
+        if papers is not None:
+            logging.info(f"Year {year} already harvested, loaded {partition}")
+        else:
+            logging.info(f"Harvesting OAI-PMH records of {year}...")
+            try:
+                papers = _harvest_year(year, patterns, start_year, end_year, cache)
+            except (TransientError, requests.RequestException, RuntimeError, ET.ParseError) as e:
+                # keep what was collected so far; a later run harvests this year again
+                logging.error(f"Error processing year {year}: {e}")
+                continue
+            if partition:
+                # the harvest date and filters tell later runs whether the year is reusable
+                with open(partition, "wb") as f:
+                    f.write(orjson.dumps({"harvested": datetime.date.today().isoformat(),
+                                          "keywords": keywords,
+                                          "papers": papers}))
+
+        for topic in content:
+            content[topic].update(papers.get(topic, {}))
+        logging.info(f"Year {year} completed. Found {sum(len(v) for v in papers.values())} papers.")
+
+    for topic in content:
+        logging.info(f"Historical collection completed for {topic}. Total papers: {len(content[topic])}")
+
+    return content
+
+def _check_link(url, validators=None):
+    """
+    HEAD a url, conditionally if validators from an earlier check are known
+    @param validators: dict with "etag" and "last_modified", or None
+    @return: (status, validators); a 304 Not Modified counts as 200
+    """
+    validators = dict(validators or {})
+    headers = dict()
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    response = http_request("HEAD", url, timeout=5, headers=headers, allow_redirects=True)
+    if response.headers.get("ETag"):
+        validators["etag"] = response.headers["ETag"]
+    if response.headers.get("Last-Modified"):
+        validators["last_modified"] = response.headers["Last-Modified"]
+    status = 200 if response.status_code == 304 else response.status_code
+    return status, validators
+
+def update_paper_links(json_file, cache=None):
     """
     Update paper links in existing JSON file
+    @param cache: dict or None, caches the HEAD status and validators of each link
+    @return: dict, the updated data
     """
     logging.info("Updating paper links...")
     
-    with open(json_file, "r") as f:
+    with open(json_file, "rb") as f:
         content = f.read()
         if not content:
             data = {}
         else:
-            data = json.loads(content)
+            data = orjson.loads(content)
     
-    # For each paper, verify and update links
+    # Only links that would change need verifying
+    pending = []
     for topic in data:
-        for paper_id in data[topic]:
-            try:
-                # Reconstruct arXiv URL
-                clean_id = paper_id.split('v')[0] if 'v' in paper_id else paper_id
-                new_url = f"{arxiv_url}abs/{clean_id}"
-                
-                # Test if URL is accessible
-                response = requests.head(new_url, timeout=5)
-                if response.status_code == 200:
-                    # Update the entry with new URL
-                    entry = data[topic][paper_id]
-                    if isinstance(entry, str):
-                        # Update URL in the markdown format
-                        data[topic][paper_id] = re.sub(
-                            r'\[([^\]]+)\]\([^)]+\)',
-                            f'[{clean_id}]({new_url})',
-                            entry
-                        )
-                
-            except Exception as e:
-                logging.warning(f"Could not update link for {paper_id}: {e}")
+        for paper_id, entry in data[topic].items():
+            # Reconstruct arXiv URL
+            clean_id = paper_id.split('v')[0] if 'v' in paper_id else paper_id
+            new_url = f"{arxiv_url}abs/{clean_id}"
+            # records carry no link, format_paper rebuilds it from the key
+            if not isinstance(entry, str) or new_url in entry:
+                continue
+            pending.append((topic, paper_id, clean_id, new_url))
+
+    # Test if URLs are accessible, a few at a time to stay polite to arxiv.org
+    statuses = dict()
+    futures = dict()
+    with ThreadPoolExecutor(max_workers=LINK_WORKERS) as executor:
+        for _, _, _, new_url in pending:
+            status = cache_get(cache, "head:" + new_url)
+            if status is not _MISSING:
+                statuses[new_url] = status
+            elif new_url not in futures:
+                validators = cache_get(cache, "validators:" + new_url)
+                if validators is _MISSING:
+                    validators = None
+                futures[new_url] = executor.submit(_check_link, new_url, validators)
+
+    for new_url, future in futures.items():
+        try:
+            statuses[new_url], validators = future.result()
+            cache_put(cache, "head:" + new_url, statuses[new_url])
+            cache_put(cache, "validators:" + new_url, validators)
+        except (TransientError, requests.RequestException) as e:
+            logging.warning(f"Could not check link {new_url}: {e}")
+
+    for topic, paper_id, clean_id, new_url in pending:
+        if statuses.get(new_url) != 200:
+            continue
+        # Update URL in the markdown format
+        data[topic][paper_id] = _LINK_RE.sub(
+            f'[{clean_id}]({new_url})',
+            data[topic][paper_id]
+        )
     
     # Save updated data
-    with open(json_file, "w") as f:
-        json.dump(data, f, indent=2)
+    with open(json_file, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
     
     logging.info("Paper links updated")
+    return data
 
 def update_json_file(filename, data_dict):
     '''
     daily update json file using data_dict
+    return: the merged data written to filename
     '''
-    # Create directory if it doesn't exist
-    os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
-    
-    # Load existing data
+    # Load existing data, updated in place below
     if os.path.exists(filename):
-        with open(filename, "r") as f:
+        with open(filename, "rb") as f:
             content = f.read()
             if not content:
-                m = {}
+                json_data = {}
             else:
-                m = json.loads(content)
+                json_data = orjson.loads(content)
     else:
-        m = {}
-            
-    json_data = m.copy() 
+        json_data = {}
     
     # update papers in each keywords         
     for data in data_dict:
-        for keyword in data.keys():
-            papers = data[keyword]
-
-            if keyword in json_data.keys():
+        for keyword, papers in data.items():
+            if keyword in json_data:
                 json_data[keyword].update(papers)
             else:
                 json_data[keyword] = papers
 
-    with open(filename, "w") as f:
-        json.dump(json_data, f, indent=2)
+    with open(filename, "wb") as f:
+        f.write(orjson.dumps(json_data, option=orjson.OPT_INDENT_2))
+    return json_data
     
-def json_to_md(filename, md_filename,
+def json_to_md(data, md_filename,
                task='',
                to_web=True, 
                use_title=True, 
                use_tc=True,
                show_badge=False,
-               use_b2t=True):
+               use_b2t=True,
+               use_list=False):
     """
-    @param filename: str
+    @param data: dict of topic -> papers, or str path of a JSON file holding it
     @param md_filename: str
+    @param use_list: render papers as list items instead of table rows
     @return None
     """
     def pretty_math(s: str) -> str:
+        # most titles have no TeX at all; skip the regex for them
+        if '$' not in s:
+            return s
         ret = ''
-        match = re.search(r"\$.*\$", s)
+        match = _MATH_RE.search(s)
         if match == None:
             return s
         math_start, math_end = match.span()
@@ -310,107 +659,109 @@ def json_to_md(filename, md_filename,
     DateNow = str(DateNow)
     DateNow = DateNow.replace('-', '.')
     
-    with open(filename, "r") as f:
-        content = f.read()
-        if not content:
-            data = {}
-        else:
-            data = json.loads(content)
+    if isinstance(data, str):
+        with open(data, "rb") as f:
+            content = f.read()
+            if not content:
+                data = {}
+            else:
+                data = orjson.loads(content)
 
-    # Create directory if it doesn't exist
-    os.makedirs(os.path.dirname(md_filename) if os.path.dirname(md_filename) else '.', exist_ok=True)
+    # Build the whole page in memory and write it out once
+    parts = []
 
-    with open(md_filename, "w+") as f:
-        pass
+    if (use_title == True) and (to_web == True):
+        parts.append("---\n" + "layout: default\n" + "---\n\n")
+    
+    if show_badge == True:
+        parts.append(f"[![Contributors][contributors-shield]][contributors-url]\n")
+        parts.append(f"[![Forks][forks-shield]][forks-url]\n")
+        parts.append(f"[![Stargazers][stars-shield]][stars-url]\n")
+        parts.append(f"[![Issues][issues-shield]][issues-url]\n\n")    
+            
+    # Updated title for symplectic geometry
+    if use_title == True:
+        parts.append("# Collection of Articles on Symplectic Geometry\n\n")
+        parts.append("> Automatically updated on " + DateNow + "\n")
+    else:
+        parts.append("> Automatically updated on " + DateNow + "\n")
+
+    parts.append("\n")
+
+    # topics with at least one paper, shared by the table of contents and the body
+    topics = [keyword for keyword, day_content in data.items() if day_content]
+
+    if use_tc == True:
+        parts.append("<details>\n")
+        parts.append("  <summary>Table of Contents</summary>\n")
+        parts.append("  <ol>\n")
+        for keyword in topics:
+            kw = keyword.replace(' ', '-').replace(',', '').replace('(', '').replace(')', '')
+            parts.append(f"    <li><a href=#{kw.lower()}>{keyword}</a></li>\n")
+        parts.append("  </ol>\n")
+        parts.append("</details>\n\n")
+    
+    for keyword in topics:
+        day_content = data[keyword]
 
-    with open(md_filename, "a+") as f:
-        if (use_title == True) and (to_web == True):
-            f.write("---\n" + "layout: default\n" + "---\n\n")
-        
-        if show_badge == True:
-            f.write(f"[![Contributors][contributors-shield]][contributors-url]\n")
-            f.write(f"[![Forks][forks-shield]][forks-url]\n")
-            f.write(f"[![Stargazers][stars-shield]][stars-url]\n")
-            f.write(f"[![Issues][issues-shield]][issues-url]\n\n")    
-                
-        # Updated title for symplectic geometry
-        if use_title == True:
-            f.write("# Collection of Articles on Symplectic Geometry\n\n")
-            f.write("> Automatically updated on " + DateNow + "\n")
-        else:
-            f.write("> Automatically updated on " + DateNow + "\n")
-
-        f.write("\n")
-
-        if use_tc == True:
-            f.write("<details>\n")
-            f.write("  <summary>Table of Contents</summary>\n")
-            f.write("  <ol>\n")
-            for keyword in data.keys():
-                day_content = data[keyword]
-                if not day_content:
-                    continue
-                kw = keyword.replace(' ', '-').replace(',', '').replace('(', '').replace(')', '')
-                f.write(f"    <li><a href=#{kw.lower()}>{keyword}</a></li>\n")
-            f.write("  </ol>\n")
-            f.write("</details>\n\n")
-        
-        for keyword in data.keys():
-            day_content = data[keyword]
-            if not day_content:
-                continue
+        parts.append(f"## {keyword}\n\n")
 
-            f.write(f"## {keyword}\n\n")
+        if use_title == True:
+            if to_web == False:
+                parts.append("|Publish Date|Title|Authors|PDF|Code|\n" + "|---|---|---|---|---|\n")
+            else:
+                parts.append("| Publish Date | Title | Authors | PDF | Code |\n")
+                parts.append("|:---------|:-----------------------|:---------|:------|:------|\n")
 
-            if use_title == True:
-                if to_web == False:
-                    f.write("|Publish Date|Title|Authors|PDF|Code|\n" + "|---|---|---|---|---|\n")
-                else:
-                    f.write("| Publish Date | Title | Authors | PDF | Code |\n")
-                    f.write("|:---------|:-----------------------|:---------|:------|:------|\n")
+        # newest papers first
+        for k in sorted(day_content, reverse=True):
+            v = day_content[k]
+            if v is None:
+                continue
+            if isinstance(v, str):
+                # entry stored pre-rendered by an older version
+                parts.append(pretty_math(v))
+            else:
+                parts.append(pretty_math(format_paper(k, v, use_list)))
 
-            day_content = sort_papers(day_content)
+        parts.append(f"\n")
         
-            for _, v in day_content.items():
-                if v is not None:
-                    f.write(pretty_math(v)) 
-
-            f.write(f"\n")
-            
-            if use_b2t:
-                top_info = f"#Updated on {DateNow}"
-                top_info = top_info.replace(' ', '-').replace('.', '')
-                f.write(f"<p align=right>(<a href={top_info.lower()}>back to top</a>)</p>\n\n")
+        if use_b2t:
+            top_info = f"#Updated on {DateNow}"
+            top_info = top_info.replace(' ', '-').replace('.', '')
+            parts.append(f"<p align=right>(<a href={top_info.lower()}>back to top</a>)</p>\n\n")
+    
+    # Add footer with your name
+    parts.append("\n---\n\n")
+    parts.append("*Created by Yassine Ait Mohamed*\n\n")
+    parts.append("This collection is automatically updated using arXiv API to track the latest research in symplectic geometry and related fields.\n")
         
-        # Add footer with your name
-        f.write("\n---\n\n")
-        f.write("*Created by Yassine Ait Mohamed*\n\n")
-        f.write("This collection is automatically updated using arXiv API to track the latest research in symplectic geometry and related fields.\n")
-            
-        if show_badge == True:
-            # Updated badge URLs for your repo
-            f.write((f"[contributors-shield]: https://img.shields.io/github/"
-                     f"contributors/YassineAitMohamed/symplectic-arxiv-daily.svg?style=for-the-badge\n"))
-            f.write((f"[contributors-url]: https://github.com/YassineAitMohamed/"
-                     f"symplectic-arxiv-daily/graphs/contributors\n"))
-            f.write((f"[forks-shield]: https://img.shields.io/github/forks/YassineAitMohamed/"
-                     f"symplectic-arxiv-daily.svg?style=for-the-badge\n"))
-            f.write((f"[forks-url]: https://github.com/YassineAitMohamed/"
-                     f"symplectic-arxiv-daily/network/members\n"))
-            f.write((f"[stars-shield]: https://img.shields.io/github/stars/YassineAitMohamed/"
-                     f"symplectic-arxiv-daily.svg?style=for-the-badge\n"))
-            f.write((f"[stars-url]: https://github.com/YassineAitMohamed/"
-                     f"symplectic-arxiv-daily/stargazers\n"))
-            f.write((f"[issues-shield]: https://img.shields.io/github/issues/YassineAitMohamed/"
-                     f"symplectic-arxiv-daily.svg?style=for-the-badge\n"))
-            f.write((f"[issues-url]: https://github.com/YassineAitMohamed/"
-                     f"symplectic-arxiv-daily/issues\n\n"))
-                
+    if show_badge == True:
+        # Updated badge URLs for your repo
+        parts.append((f"[contributors-shield]: https://img.shields.io/github/"
+                      f"contributors/YassineAitMohamed/symplectic-arxiv-daily.svg?style=for-the-badge\n"))
+        parts.append((f"[contributors-url]: https://github.com/YassineAitMohamed/"
+                      f"symplectic-arxiv-daily/graphs/contributors\n"))
+        parts.append((f"[forks-shield]: https://img.shields.io/github/forks/YassineAitMohamed/"
+                      f"symplectic-arxiv-daily.svg?style=for-the-badge\n"))
+        parts.append((f"[forks-url]: https://github.com/YassineAitMohamed/"
+                      f"symplectic-arxiv-daily/network/members\n"))
+        parts.append((f"[stars-shield]: https://img.shields.io/github/stars/YassineAitMohamed/"
+                      f"symplectic-arxiv-daily.svg?style=for-the-badge\n"))
+        parts.append((f"[stars-url]: https://github.com/YassineAitMohamed/"
+                      f"symplectic-arxiv-daily/stargazers\n"))
+        parts.append((f"[issues-shield]: https://img.shields.io/github/issues/YassineAitMohamed/"
+                      f"symplectic-arxiv-daily.svg?style=for-the-badge\n"))
+        parts.append((f"[issues-url]: https://github.com/YassineAitMohamed/"
+                      f"symplectic-arxiv-daily/issues\n\n"))
+
+    with open(md_filename, "w", encoding="utf-8") as f:
+        f.write("".join(parts))
+
     logging.info(f"{task} finished")        
 
 def demo(**config):
     data_collector = []
-    data_collector_web = []
     
     keywords = config['kv']
     max_results = config['max_results']
@@ -423,33 +774,45 @@ def demo(**config):
     b_historical = config.get('historical_init', False)
     start_year = config.get('start_year', 1990)
     end_year = config.get('end_year', None)
+    cache_file = None if config.get('no_cache', False) else config.get('cache_path')
+    cache = load_cache(cache_file) if cache_file else None
+
+    # Create the output directories once, up front
+    outputs = [cache_file]
+    for target in ('readme', 'gitpage', 'wechat'):
+        if config[f'publish_{target}']:
+            outputs += [config[f'json_{target}_path'], config[f'md_{target}_path']]
+    for d in {os.path.dirname(path) for path in outputs if path}:
+        if d:
+            os.makedirs(d, exist_ok=True)
     
     logging.info(f'Update Paper Link = {b_update}')
     logging.info(f'Historical Init = {b_historical}')
+    logging.info(f'Lookup Cache = {cache_file}')
     
     if b_historical:
         logging.info(f"Starting HISTORICAL collection from {start_year}")
-        for topic, keyword in keywords.items():
-            logging.info(f"Historical collection for keyword: {topic}")
-            data, data_web = get_historical_papers(
-                topic=topic, 
-                query=keyword, 
-                start_year=start_year, 
-                end_year=end_year,
-                max_per_year=500
-            )
-            data_collector.append(data)
-            data_collector_web.append(data_web)
-            print("\n")
+        partition_dir = None
+        if config.get('historical_dir'):
+            partition_dir = os.path.join(config['historical_dir'], f"{start_year}-{end_year or 'now'}")
+        # one harvest serves every topic
+        data = get_historical_papers(
+            keywords,
+            start_year=start_year, 
+            end_year=end_year,
+            cache=cache,
+            partition_dir=partition_dir
+        )
+        data_collector.append(data)
+        print("\n")
         logging.info(f"HISTORICAL collection completed")
         
     elif not b_update:
         logging.info(f"GET daily symplectic geometry papers begin")
         for topic, keyword in keywords.items():
             logging.info(f"Keyword: {topic}")
-            data, data_web = get_daily_papers(topic, query=keyword, max_results=max_results)
+            data = get_daily_papers(topic, query=keyword, max_results=max_results, cache=cache)
             data_collector.append(data)
-            data_collector_web.append(data_web)
             print("\n")
         logging.info(f"GET daily symplectic geometry papers end")
 
@@ -457,28 +820,31 @@ def demo(**config):
         json_file = config['json_readme_path']
         md_file = config['md_readme_path']
         if config.get('update_paper_links', False):
-            update_paper_links(json_file)
+            json_data = update_paper_links(json_file, cache=cache)
         else:    
-            update_json_file(json_file, data_collector)
-        json_to_md(json_file, md_file, task='Update Symplectic Geometry Readme', show_badge=show_badge)
+            json_data = update_json_file(json_file, data_collector)
+        json_to_md(json_data, md_file, task='Update Symplectic Geometry Readme', show_badge=show_badge)
 
     if publish_gitpage:
         json_file = config['json_gitpage_path']
         md_file = config['md_gitpage_path']
         if config.get('update_paper_links', False):
-            update_paper_links(json_file)
+            json_data = update_paper_links(json_file, cache=cache)
         else:    
-            update_json_file(json_file, data_collector)
-        json_to_md(json_file, md_file, task='Update GitPage', to_web=True, use_title=False, show_badge=show_badge, use_tc=False, use_b2t=False)
+            json_data = update_json_file(json_file, data_collector)
+        json_to_md(json_data, md_file, task='Update GitPage', to_web=True, use_title=False, show_badge=show_badge, use_tc=False, use_b2t=False)
 
     if publish_wechat:
         json_file = config['json_wechat_path']
         md_file = config['md_wechat_path']
         if config.get('update_paper_links', False):
-            update_paper_links(json_file)
+            json_data = update_paper_links(json_file, cache=cache)
         else:    
-            update_json_file(json_file, data_collector_web)
-        json_to_md(json_file, md_file, task='Update Wechat', to_web=False, use_title=False, show_badge=show_badge)
+            json_data = update_json_file(json_file, data_collector)
+        json_to_md(json_data, md_file, task='Update Wechat', to_web=False, use_title=False, show_badge=show_badge,
+                   use_list=True)
+
+    save_cache(cache_file, cache)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -492,6 +858,8 @@ if __name__ == "__main__":
                         help='start year for historical collection')
     parser.add_argument('--end_year', type=int, default=None, 
                         help='end year for historical collection (default: current year)')
+    parser.add_argument('--no_cache', default=False, action="store_true", 
+                        help='ignore the on-disk paperswithcode/link lookup cache')
                         
     args = parser.parse_args()
     config = load_config(args.config_path)
@@ -500,6 +868,7 @@ if __name__ == "__main__":
         'update_paper_links': args.update_paper_links,
         'historical_init': args.historical_init,
         'start_year': args.start_year,
-        'end_year': args.end_year
+        'end_year': args.end_year,
+        'no_cache': args.no_cache
     }
     demo(**config)